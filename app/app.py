@@ -1,69 +1,137 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Blueprint, render_template, request, jsonify
 import numpy as np
-import pandas as pd
-from sklearn.preprocessing import StandardScaler
-import joblib
 import os
-import xgboost as xgb
-from models.feature_engineering import prepare_features
-from models.statistics import HeartDiseaseStatistics
+import atexit
+import threading
+from models.serialization import SerializedCache, json_response
+from models.validation import VALID_RANGES, parse_form, parse_json
+# Re-exported for code that still imports the validation helpers from app
+from models.validation import VALID_RANGES_MIN, VALID_RANGES_MAX, validate_input
+
+# Heavy dependencies (pandas, scikit-learn, matplotlib, seaborn, scipy) are
+# imported on first use so that each deployment profile only loads what it
+# serves. APP_PROFILE selects the routes a worker exposes:
+#   full      - every page and API (default)
+#   predict   - only POST /predict; never imports the plotting stack or scipy
+#   dashboard - the pages and /api/statistics, without the prediction model
+APP_PROFILES = {
+    'full': ('predict', 'dashboard'),
+    'predict': ('predict',),
+    'dashboard': ('dashboard',)
+}
+APP_PROFILE = os.environ.get('APP_PROFILE', 'full')
+
+# MODEL_VARIANT=compressed serves the reduced support-vector model written by
+# retrain_model.py instead of the exact SVC
+MODEL_VARIANT = os.environ.get('MODEL_VARIANT', 'exact')
 
 app = Flask(__name__)
 
+# Routes are grouped per profile and registered at the bottom of this module
+predict_bp = Blueprint('predict', __name__)
+dashboard_bp = Blueprint('dashboard', __name__)
+
 # Add abs filter to Jinja2
 app.jinja_env.filters['abs'] = abs
 
 # Initialize model and scaler as None
 model = None
 scaler = None
+model_version = None
 
-# Initialize statistics module
-stats = HeartDiseaseStatistics()
-
-# Define valid ranges for each feature
-VALID_RANGES = {
-    'age': (20, 100),
-    'sex': (0, 1),
-    'cp': (0, 3),
-    'trestbps': (80, 200),
-    'chol': (100, 600),
-    'fbs': (0, 1),
-    'restecg': (0, 2),
-    'thalach': (60, 220),
-    'exang': (0, 1),
-    'oldpeak': (0, 6.2),
-    'slope': (0, 2),
-    'ca': (0, 3),
-    'thal': (1, 3)
-}
+# Path to the training dataset
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models', 'data', 'heart_disease_combined.csv')
+
+def get_dataset_version():
+    """Use the dataset modification time as its version"""
+    return os.path.getmtime(DATA_PATH)
+
+# Statistics module, created on the first dashboard request and reloaded
+# whenever the dataset changes, so every dashboard cache follows one version
+stats = None
+stats_version = None
+stats_lock = threading.Lock()
+
+def get_stats():
+    """Return the shared statistics module for the current dataset version"""
+    global stats, stats_version
+    version = get_dataset_version()
+    with stats_lock:
+        if stats is None or stats_version != version:
+            from models.statistics import HeartDiseaseStatistics
+            stats = HeartDiseaseStatistics(DATA_PATH)
+            stats_version = version
+        return stats
 
-VALID_RANGES_MIN = {k: v[0] for k, v in VALID_RANGES.items()}
-VALID_RANGES_MAX = {k: v[1] for k, v in VALID_RANGES.items()}
+# Dashboard plots, rendered in a background process pool
+plot_renderer = None
 
-def validate_input(data):
-    """Validate input data against defined ranges"""
-    errors = []
-    for feature, value in data.items():
-        if feature in VALID_RANGES:
-            min_val, max_val = VALID_RANGES[feature]
-            if not isinstance(value, (int, float)) or value < min_val or value > max_val:
-                errors.append(f"{feature} must be between {min_val} and {max_val}")
-    return errors
+def get_plot_renderer():
+    """Return the shared plot renderer, starting it on first use"""
+    global plot_renderer
+    if plot_renderer is None:
+        from models.plots import PlotRenderer
+        plot_renderer = PlotRenderer()
+        atexit.register(plot_renderer.shutdown)
+    return plot_renderer
+
+def submit_plots():
+    """Queue rendering of the dashboard plots for the current dataset"""
+    get_plot_renderer().submit(get_dataset_version(), get_stats().get_plot_data)
+
+# Prediction audit log, written by a background thread
+audit_log = None
+
+def get_audit_log():
+    """Return the audit log, starting its writer thread on first use"""
+    global audit_log
+    if audit_log is None:
+        from models.audit import AuditLog
+        db_path = os.environ.get('AUDIT_DB_PATH',
+                                 os.path.join(os.path.dirname(os.path.abspath(__file__)), 'audit', 'predictions.db'))
+        audit_log = AuditLog(db_path)
+        atexit.register(audit_log.close)
+    return audit_log
+
+# Drift monitor for /predict inputs, created on the first prediction
+drift_monitor = None
+
+def get_drift_monitor():
+    """Return the drift monitor, building reference histograms on first use"""
+    global drift_monitor
+    if drift_monitor is None:
+        import pandas as pd
+        from models.drift import DriftMonitor
+        drift_monitor = DriftMonitor(pd.read_csv(DATA_PATH), valid_ranges=VALID_RANGES)
+    return drift_monitor
 
 def load_model():
-    global model, scaler
+    global model, scaler, model_version
+    import joblib
+    import hashlib
     try:
         # Get the absolute path to the model files
         base_path = os.path.dirname(os.path.abspath(__file__))
-        model_path = os.path.join(base_path, 'models', 'heart_disease_model.pkl')
+        if MODEL_VARIANT == 'compressed':
+            model_path = os.path.join(base_path, 'models', 'heart_disease_model_compressed.npz')
+        else:
+            model_path = os.path.join(base_path, 'models', 'heart_disease_model.pkl')
         scaler_path = os.path.join(base_path, 'models', 'scaler.pkl')
         
         print(f"Loading model from: {model_path}")
         print(f"Loading scaler from: {scaler_path}")
         
-        model = joblib.load(model_path)
+        if MODEL_VARIANT == 'compressed':
+            from models.compressed_svm import CompressedSVC
+            model = CompressedSVC.load(model_path)
+        else:
+            model = joblib.load(model_path)
         scaler = joblib.load(scaler_path)
         
+        # Identify the model by a hash of its file for the audit log
+        with open(model_path, 'rb') as f:
+            model_version = hashlib.sha256(f.read()).hexdigest()[:12]
+        
         print("Model and scaler loaded successfully!")
         print(f"Model type: {type(model)}")
         
@@ -71,28 +139,28 @@ def load_model():
         print(f"Error loading model: {str(e)}")
         raise e
 
-@app.route('/')
+@dashboard_bp.route('/')
 def home():
     """Render the home page with statistics"""
     try:
+        stats = get_stats()
         basic_stats = stats.get_basic_stats()
         risk_factors = stats.get_risk_factors()
         correlations = stats.get_correlation_analysis()
-        plots = stats.generate_plots()
         
         return render_template('index.html',
                              basic_stats=basic_stats,
                              risk_factors=risk_factors,
-                             correlations=correlations,
-                             plots=plots)
+                             correlations=correlations)
     except Exception as e:
         print(f"Error in home route: {str(e)}")
         return render_template('error.html', error=str(e))
 
-@app.route('/ml-process')
+@dashboard_bp.route('/ml-process')
 def ml_process():
     """Render the ML process page with actual statistics"""
     # Get statistics from our HeartDiseaseStatistics class
+    stats = get_stats()
     basic_stats = stats.get_basic_stats()
     risk_factors = stats.get_risk_factors()
     correlations = stats.get_correlation_analysis()
@@ -119,7 +187,7 @@ def ml_process():
                          model_params=model_info['model_params'],
                          metrics=model_info['metrics'])
 
-@app.route('/prediction-process')
+@dashboard_bp.route('/prediction-process')
 def prediction_process():
     """Render the prediction process visualization page"""
     # Example data for demonstration
@@ -133,7 +201,7 @@ def prediction_process():
     }
     return render_template('prediction_process.html', example_data=example_data)
 
-@app.route('/predict', methods=['POST'])
+@predict_bp.route('/predict', methods=['POST'])
 def predict():
     try:
         # Check if model is loaded
@@ -147,51 +215,55 @@ def predict():
                     'message': 'Model not available. Please try again later.'
                 }), 500
         
-        print("Received form data:", request.form)
-        
-        # Get form data and convert to appropriate types
+        # Accept either a submitted form or a JSON object with the same fields
         try:
-            data = {
-                'age': int(request.form['age']),
-                'sex': int(request.form['sex']),
-                'cp': int(request.form['cp']),
-                'trestbps': int(request.form['trestbps']),
-                'chol': int(request.form['chol']),
-                'fbs': int(request.form['fbs']),
-                'restecg': int(request.form['restecg']),
-                'thalach': int(request.form['thalach']),
-                'exang': int(request.form['exang']),
-                'oldpeak': float(request.form['oldpeak']),
-                'slope': int(request.form['slope']),
-                'ca': int(request.form['ca']),
-                'thal': int(request.form['thal'])
-            }
-        except KeyError as ke:
-            print(f"Missing form field: {str(ke)}")
+            if request.is_json:
+                payload = request.get_json(silent=True)
+                print("Received JSON data:", payload)
+                if payload is None:
+                    return jsonify({
+                        'status': 'error',
+                        'message': 'Invalid request body: Expected a JSON object or a list of objects'
+                    }), 400
+                result = parse_json(payload)
+            else:
+                print("Received form data:", request.form)
+                result = parse_form(request.form)
+        except ValueError as ve:
+            print(f"Invalid request body: {str(ve)}")
             return jsonify({
                 'status': 'error',
-                'message': f'Missing required field: {str(ke)}'
+                'message': f'Invalid request body: {str(ve)}'
             }), 400
-        except ValueError as ve:
-            print(f"Invalid value in form: {str(ve)}")
+        
+        if len(result) != 1:
             return jsonify({
                 'status': 'error',
-                'message': f'Invalid value format: {str(ve)}'
+                'message': 'Expected exactly one patient record'
             }), 400
-            
-        print("Parsed data:", data)
         
         # Validate input
-        validation_errors = validate_input(data)
-        if validation_errors:
-            print("Validation errors:", validation_errors)
+        if not result.valid:
+            errors = result.messages()
+            print("Validation errors:", errors)
             return jsonify({
                 'status': 'error',
-                'message': 'Invalid input values: ' + '; '.join(validation_errors)
+                'message': 'Invalid input values: ' + '; '.join(e['message'] for e in errors),
+                'errors': [{'field': e['field'], 'message': e['message']} for e in errors]
             }), 400
         
+        data = result.to_dicts()[0]
+        print("Parsed data:", data)
+        
+        # Record the input for drift monitoring; never fail a prediction over it
+        try:
+            get_drift_monitor().observe(data)
+        except Exception as e:
+            print(f"Error recording input for drift monitoring: {str(e)}")
+        
         # Engineer features
         try:
+            from models.feature_engineering import prepare_features
             input_df = prepare_features(data)
             print("Engineered features DataFrame:", input_df.head())
             print("Engineered features columns:", input_df.columns.tolist())
@@ -232,10 +304,7 @@ def predict():
         
         # Make prediction
         try:
-            if isinstance(model, xgb.XGBClassifier):
-                probability = model.predict_proba(input_scaled)[0, 1]
-            else:
-                probability = model.predict_proba(input_scaled)[0, 1]
+            probability = model.predict_proba(input_scaled)[0, 1]
                 
             prediction = int(probability > 0.5)
             print("Raw prediction:", prediction)
@@ -357,7 +426,7 @@ def predict():
         
         response = {
             'prediction': prediction,
-            'probability': probability,
+            'probability': float(probability),
             'risk_level': risk_level,
             'confidence': f"{confidence:.1f}%",
             'top_risk_factors': [
@@ -371,8 +440,14 @@ def predict():
             'status': 'success'
         }
         
+        # Queue the prediction for the audit log; the write happens off the request path
+        try:
+            get_audit_log().record(data, model_version, prediction, probability, risk_level)
+        except Exception as e:
+            print(f"Error recording prediction in audit log: {str(e)}")
+        
         print("Sending response:", response)
-        return jsonify(response)
+        return json_response(response)
         
     except Exception as e:
         print(f"Unexpected error: {str(e)}")
@@ -381,104 +456,137 @@ def predict():
             'message': f'An unexpected error occurred. Please try again.'
         }), 500
 
-@app.route('/api/statistics')
-def get_statistics():
-    try:
-        # Load the dataset
-        df = pd.read_csv('models/data/heart_disease_combined.csv')
-        
-        # Basic dataset statistics
-        total_patients = len(df)
-        disease_count = len(df[df['target'] == 1])
-        healthy_count = len(df[df['target'] == 0])
-        disease_percentage = round((disease_count / total_patients) * 100, 1)
-        
-        # Age statistics
-        mean_age = round(df['age'].mean(), 1)
-        age_data = df['age'].tolist()
-        diseased_ages = df[df['target'] == 1]['age'].tolist()
-        
-        # Gender statistics
-        male_count = len(df[df['sex'] == 1])
-        female_count = len(df[df['sex'] == 0])
-        
-        # Risk factors analysis
-        def calculate_risk_percentage(df, column, labels=None):
-            risk_by_category = df.groupby(column)['target'].agg(['count', 'mean']).round(3)
-            risk_by_category['percentage'] = (risk_by_category['mean'] * 100).round(1)
-            risk_by_category['total_count'] = risk_by_category['count']
-            
-            result = []
-            for category in risk_by_category.index:
-                label = labels.get(category, category) if labels else str(category)
-                result.append({
-                    'category': label,
-                    'risk_percentage': float(risk_by_category.loc[category, 'percentage']),
-                    'count': int(risk_by_category.loc[category, 'total_count'])
-                })
-            return sorted(result, key=lambda x: x['risk_percentage'], reverse=True)
-
-        # Define labels for different features
-        cp_labels = {
-            0: 'Typical Angina',
-            1: 'Atypical Angina',
-            2: 'Non-Anginal Pain',
-            3: 'Asymptomatic',
-            4: 'Asymptomatic'  # Map type 4 to Asymptomatic as well
-        }
-        
-        # Clean the chest pain types - map type 4 to type 3 (both are Asymptomatic)
-        df['cp'] = df['cp'].replace(4, 3)
-        
-        sex_labels = {
-            0: 'Female',
-            1: 'Male'
-        }
-        
-        fbs_labels = {
-            0: 'Normal Fasting Blood Sugar',
-            1: 'High Fasting Blood Sugar'
-        }
-        
-        exang_labels = {
-            0: 'No Exercise Angina',
-            1: 'Exercise Angina'
+def calculate_risk_percentage(df, column, labels=None):
+    """Disease rate and patient count per category, highest risk first"""
+    risk_by_category = df.groupby(column)['target'].agg(['count', 'mean'])
+    percentages = (risk_by_category['mean'].round(3) * 100).round(1).to_numpy()
+    counts = risk_by_category['count'].to_numpy()
+    categories = risk_by_category.index.to_numpy()
+    order = np.argsort(-percentages, kind='stable')
+    return [
+        {
+            'category': labels.get(categories[i], categories[i]) if labels else str(categories[i]),
+            'risk_percentage': float(percentages[i]),
+            'count': int(counts[i])
         }
-        
-        # Calculate risk factors
-        risk_factors = {
-            'chest_pain': calculate_risk_percentage(df, 'cp', cp_labels),
-            'gender': calculate_risk_percentage(df, 'sex', sex_labels),
-            'fasting_blood_sugar': calculate_risk_percentage(df, 'fbs', fbs_labels),
-            'exercise_angina': calculate_risk_percentage(df, 'exang', exang_labels)
-        }
-        
-        # Calculate correlations with target
-        correlations = df.corr()['target'].drop('target')
-        correlations = correlations.sort_values(ascending=False)
-        correlations = {k: round(float(v), 3) for k, v in correlations.items()}
-        
+        for i in order
+    ]
+
+@predict_bp.route('/api/drift')
+def get_drift():
+    """Drift of this worker's /predict inputs against the training data"""
+    try:
+        report = get_drift_monitor().report()
+    except Exception as e:
+        print(f"Error in get_drift: {str(e)}")
         return jsonify({
-            'status': 'success',
-            'dataset_stats': {
-                'total_patients': total_patients,
-                'disease_count': disease_count,
-                'healthy_count': healthy_count,
-                'disease_percentage': disease_percentage
-            },
-            'age_stats': {
-                'mean_age': mean_age,
-                'age_data': age_data,
-                'diseased_ages': diseased_ages
-            },
-            'gender_stats': {
-                'male_count': male_count,
-                'female_count': female_count
-            },
-            'risk_factors': risk_factors,
-            'correlations': correlations
-        })
-        
+            'status': 'error',
+            'message': 'An error occurred while computing input drift'
+        }), 500
+    
+    return json_response({
+        'status': 'success',
+        **report
+    })
+
+@predict_bp.route('/api/audit/status')
+def get_audit_status():
+    """Queue depth and written/dropped counts of this worker's audit log"""
+    return json_response({
+        'status': 'success',
+        **get_audit_log().status()
+    })
+
+def build_statistics_payload():
+    """Compute the full /api/statistics payload from the dataset"""
+    import pandas as pd
+    
+    # Load the dataset
+    df = pd.read_csv(DATA_PATH)
+    target = df['target'].to_numpy()
+    
+    # Basic dataset statistics
+    total_patients = len(df)
+    disease_count = int((target == 1).sum())
+    healthy_count = int((target == 0).sum())
+    disease_percentage = round((disease_count / total_patients) * 100, 1)
+    
+    # Age statistics
+    ages = df['age'].to_numpy()
+    mean_age = round(float(ages.mean()), 1)
+    
+    # Gender statistics
+    sex = df['sex'].to_numpy()
+    male_count = int((sex == 1).sum())
+    female_count = int((sex == 0).sum())
+    
+    # Define labels for different features
+    cp_labels = {
+        0: 'Typical Angina',
+        1: 'Atypical Angina',
+        2: 'Non-Anginal Pain',
+        3: 'Asymptomatic',
+        4: 'Asymptomatic'  # Map type 4 to Asymptomatic as well
+    }
+    
+    # Clean the chest pain types - map type 4 to type 3 (both are Asymptomatic)
+    df['cp'] = df['cp'].replace(4, 3)
+    
+    sex_labels = {
+        0: 'Female',
+        1: 'Male'
+    }
+    
+    fbs_labels = {
+        0: 'Normal Fasting Blood Sugar',
+        1: 'High Fasting Blood Sugar'
+    }
+    
+    exang_labels = {
+        0: 'No Exercise Angina',
+        1: 'Exercise Angina'
+    }
+    
+    # Calculate risk factors
+    risk_factors = {
+        'chest_pain': calculate_risk_percentage(df, 'cp', cp_labels),
+        'gender': calculate_risk_percentage(df, 'sex', sex_labels),
+        'fasting_blood_sugar': calculate_risk_percentage(df, 'fbs', fbs_labels),
+        'exercise_angina': calculate_risk_percentage(df, 'exang', exang_labels)
+    }
+    
+    # Calculate correlations with target
+    correlations = df.corr()['target'].drop('target')
+    correlations = correlations.sort_values(ascending=False).round(3)
+    
+    return {
+        'status': 'success',
+        'dataset_stats': {
+            'total_patients': total_patients,
+            'disease_count': disease_count,
+            'healthy_count': healthy_count,
+            'disease_percentage': disease_percentage
+        },
+        'age_stats': {
+            'mean_age': mean_age,
+            'age_data': ages,
+            'diseased_ages': ages[target == 1]
+        },
+        'gender_stats': {
+            'male_count': male_count,
+            'female_count': female_count
+        },
+        'risk_factors': risk_factors,
+        'correlations': dict(zip(correlations.index, correlations.to_numpy()))
+    }
+
+# Serialized /api/statistics body, re-encoded only when the dataset changes
+statistics_cache = SerializedCache(build_statistics_payload, get_dataset_version)
+
+@dashboard_bp.route('/api/statistics')
+def get_statistics():
+    try:
+        return statistics_cache.make_response(request)
     except Exception as e:
         print(f"Error in get_statistics: {str(e)}")
         return jsonify({
@@ -486,6 +594,110 @@ def get_statistics():
             'message': 'An error occurred while fetching statistics'
         }), 500
 
+def build_chart_data_payload():
+    """Aggregates the dashboard charts are drawn from on the client"""
+    chart_data = get_stats().get_chart_data()
+    if chart_data is None:
+        raise ValueError('Chart data is not available')
+    return {'status': 'success', 'charts': chart_data}
+
+# Serialized /api/chart-data body, re-encoded only when the dataset changes
+chart_data_cache = SerializedCache(build_chart_data_payload, get_dataset_version)
+
+@dashboard_bp.route('/api/chart-data')
+def get_chart_data():
+    try:
+        return chart_data_cache.make_response(request)
+    except Exception as e:
+        print(f"Error in get_chart_data: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'message': 'An error occurred while fetching chart data'
+        }), 500
+
+@dashboard_bp.route('/api/statistical-tests')
+def get_statistical_tests():
+    """Group tests, chi-square tests and bootstrap intervals for every feature"""
+    test_suite = get_stats().get_test_suite()
+    if test_suite is None:
+        return jsonify({
+            'status': 'error',
+            'message': 'An error occurred while running the statistical tests'
+        }), 500
+    
+    return json_response({
+        'status': 'success',
+        **test_suite
+    })
+
+@dashboard_bp.route('/api/cohort')
+def get_cohort():
+    """Statistics for an arbitrary cohort, e.g. /api/cohort?sex=1&age_group=50-60&exang=1
+
+    Repeating a filter (?cp=1&cp=2) selects any of the values. The optional
+    ``breakdown`` parameter limits which per-dimension breakdowns are returned.
+    """
+    try:
+        index = get_stats().get_cohort_index()
+        filters = {name: request.args.getlist(name) for name in request.args if name != 'breakdown'}
+        dimensions = request.args.getlist('breakdown') or None
+        cohort = index.query(filters, dimensions)
+    except ValueError as ve:
+        return jsonify({
+            'status': 'error',
+            'message': str(ve)
+        }), 400
+    except Exception as e:
+        print(f"Error in get_cohort: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'message': 'An error occurred while querying the cohort'
+        }), 500
+    
+    return json_response({
+        'status': 'success',
+        'filters': filters,
+        **cohort
+    })
+
+@dashboard_bp.route('/api/plots/<name>')
+def get_plot(name):
+    """Return a server-rendered PNG plot, or 202 while it is still rendering"""
+    from models.plots import PLOT_NAMES
+    
+    if name not in PLOT_NAMES:
+        return jsonify({
+            'status': 'error',
+            'message': f'Unknown plot: {name}'
+        }), 404
+    
+    try:
+        submit_plots()
+        image = get_plot_renderer().get(name)
+    except Exception as e:
+        print(f"Error in get_plot: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'message': 'An error occurred while rendering the plot'
+        }), 500
+    
+    if image is None:
+        return jsonify({'status': 'pending'}), 202
+    
+    return json_response({
+        'status': 'success',
+        'image': image
+    })
+
+if APP_PROFILE not in APP_PROFILES:
+    raise ValueError(f"Unknown APP_PROFILE '{APP_PROFILE}', expected one of {sorted(APP_PROFILES)}")
+
+if 'predict' in APP_PROFILES[APP_PROFILE]:
+    app.register_blueprint(predict_bp)
+if 'dashboard' in APP_PROFILES[APP_PROFILE]:
+    app.register_blueprint(dashboard_bp)
+
 if __name__ == '__main__':
-    load_model()
+    if 'predict' in APP_PROFILES[APP_PROFILE]:
+        load_model()
     app.run(debug=True)
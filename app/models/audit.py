@@ -0,0 +1,303 @@
+import argparse
+import csv
+import json
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+
+# Predictions are audited through a bounded in-memory queue drained by a
+# background thread, which writes them to SQLite in batches. The request
+# path only enqueues; all disk I/O happens on the writer thread.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS predictions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp REAL NOT NULL,
+    model_version TEXT,
+    input TEXT NOT NULL,
+    prediction INTEGER NOT NULL,
+    probability REAL NOT NULL,
+    risk_level TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_predictions_timestamp ON predictions (timestamp);
+"""
+
+COLUMNS = ['id', 'timestamp', 'model_version', 'input', 'prediction', 'probability', 'risk_level']
+
+_STOP = object()
+
+
+def connect(db_path):
+    """Open the audit database in WAL mode, creating the schema if needed"""
+    directory = os.path.dirname(db_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=5.0)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.executescript(SCHEMA)
+    return conn
+
+
+class AuditLog:
+    """Append-only prediction audit log written by a background thread
+
+    ``record`` never touches the disk. When the queue is full the
+    ``overflow`` policy decides what happens: ``'block'`` waits up to
+    ``block_timeout`` seconds for room before dropping the record, ``'drop'``
+    drops it immediately. Dropped records are counted and reported by
+    ``status``.
+
+    The writer retries opening the database with backoff, and retries a
+    batch ``write_retries`` times on SQLite operational errors (such as a
+    locked database) before counting its records as failed.
+    """
+
+    def __init__(self, db_path, max_queue=10000, batch_size=200, flush_interval=1.0,
+                 overflow='block', block_timeout=0.05, write_retries=3, retry_delay=0.1,
+                 max_retry_delay=30.0):
+        if overflow not in ('block', 'drop'):
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.write_retries = write_retries
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._written = 0
+        self._dropped = 0
+        self._errors = 0
+        self._connect_failures = 0
+        self._connected = False
+        self._last_error = None
+        self._closed = False
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='audit-writer', daemon=True)
+        self._thread.start()
+
+    def record(self, data, model_version, prediction, probability, risk_level):
+        """Queue one prediction for writing; returns False if it was dropped"""
+        if self._closed:
+            return False
+        # Serialization is left to the writer thread; copy so later changes are not logged
+        entry = (time.time(), model_version, dict(data),
+                 int(prediction), float(probability), risk_level)
+        try:
+            if self.overflow == 'block':
+                self._queue.put(entry, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(entry)
+            return True
+        except queue.Full:
+            with self._lock:
+                self._dropped += 1
+            print("Audit queue full, dropped prediction record")
+            return False
+
+    def _connect(self):
+        """Open the database, retrying with backoff; returns None if closed first"""
+        delay = self.retry_delay
+        while True:
+            try:
+                conn = connect(self.db_path)
+            except Exception as e:
+                with self._lock:
+                    self._connect_failures += 1
+                    self._last_error = str(e)
+                print(f"Error opening audit database {self.db_path}: {str(e)}")
+                if self._stopping.wait(delay):
+                    return None
+                delay = min(delay * 2, self.max_retry_delay)
+                continue
+            with self._lock:
+                self._connected = True
+            return conn
+
+    def _run(self):
+        """Writer loop: wait for a record, then drain and write a batch"""
+        conn = self._connect()
+        if conn is None:
+            # Closed before the database could be opened
+            lost = [e for e in self._drain(None) if e is not _STOP]
+            with self._lock:
+                self._errors += len(lost)
+            return
+        try:
+            stopping = False
+            while not stopping:
+                try:
+                    first = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    continue
+                batch = []
+                for entry in [first] + self._drain(self.batch_size - 1):
+                    if entry is _STOP:
+                        stopping = True
+                    else:
+                        batch.append(entry)
+                if stopping:
+                    batch.extend(e for e in self._drain(None) if e is not _STOP)
+                if batch:
+                    self._write(conn, batch)
+        finally:
+            conn.close()
+            with self._lock:
+                self._connected = False
+
+    def _drain(self, limit):
+        """Take up to ``limit`` queued entries without blocking (all if None)"""
+        entries = []
+        while limit is None or len(entries) < limit:
+            try:
+                entries.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return entries
+
+    def _write(self, conn, batch):
+        """Insert a batch in a single transaction, retrying operational errors"""
+        try:
+            rows = [(timestamp, version, json.dumps(data, separators=(',', ':')), *rest)
+                    for timestamp, version, data, *rest in batch]
+        except Exception as e:
+            self._fail(batch, e)
+            return
+        for attempt in range(self.write_retries + 1):
+            try:
+                with conn:
+                    conn.executemany(
+                        'INSERT INTO predictions (timestamp, model_version, input, prediction, '
+                        'probability, risk_level) VALUES (?, ?, ?, ?, ?, ?)', rows)
+                with self._lock:
+                    self._written += len(batch)
+                return
+            except sqlite3.OperationalError as e:
+                # Typically "database is locked" while another worker writes
+                error = e
+                if attempt < self.write_retries:
+                    time.sleep(self.retry_delay * 2 ** attempt)
+            except Exception as e:
+                error = e
+                break
+        self._fail(batch, error)
+
+    def _fail(self, batch, error):
+        """Count a batch that could not be written"""
+        with self._lock:
+            self._errors += len(batch)
+            self._last_error = str(error)
+        print(f"Error writing audit batch of {len(batch)} records: {str(error)}")
+
+    def status(self):
+        """Queue depth, record counts and the health of the writer thread"""
+        with self._lock:
+            return {
+                'queued': self._queue.qsize(),
+                'written': self._written,
+                'dropped': self._dropped,
+                'failed': self._errors,
+                'writer_alive': self._thread.is_alive(),
+                'connected': self._connected,
+                'connect_failures': self._connect_failures,
+                'last_error': self._last_error
+            }
+
+    def close(self, timeout=10.0):
+        """Flush every queued record and stop the writer thread"""
+        if self._closed:
+            return
+        self._closed = True
+        self._stopping.set()
+        if not self._thread.is_alive():
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            print("Audit queue still full at shutdown, not waiting for the writer")
+            return
+        self._thread.join(timeout)
+
+
+def query(db_path, since=None, until=None, model_version=None, limit=None):
+    """Read audit records as dicts, oldest first"""
+    conditions, params = [], []
+    if since is not None:
+        conditions.append('timestamp >= ?')
+        params.append(since)
+    if until is not None:
+        conditions.append('timestamp < ?')
+        params.append(until)
+    if model_version is not None:
+        conditions.append('model_version = ?')
+        params.append(model_version)
+    sql = f"SELECT {', '.join(COLUMNS)} FROM predictions"
+    if conditions:
+        sql += ' WHERE ' + ' AND '.join(conditions)
+    sql += ' ORDER BY id'
+    if limit is not None:
+        sql += ' LIMIT ?'
+        params.append(limit)
+
+    conn = connect(db_path)
+    try:
+        for row in conn.execute(sql, params):
+            record = dict(zip(COLUMNS, row))
+            record['input'] = json.loads(record['input'])
+            yield record
+    finally:
+        conn.close()
+
+
+def export(records, out, fmt='ndjson'):
+    """Write audit records as NDJSON or CSV (inputs flattened into columns)"""
+    count = 0
+    if fmt == 'ndjson':
+        for record in records:
+            out.write(json.dumps(record, separators=(',', ':')) + '\n')
+            count += 1
+    elif fmt == 'csv':
+        writer = None
+        for record in records:
+            row = {k: v for k, v in record.items() if k != 'input'}
+            row.update(record['input'])
+            if writer is None:
+                writer = csv.DictWriter(out, fieldnames=list(row))
+                writer.writeheader()
+            writer.writerow(row)
+            count += 1
+    else:
+        raise ValueError(f"Unknown export format: {fmt}")
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Query and export the prediction audit log')
+    parser.add_argument('--db', default=os.environ.get('AUDIT_DB_PATH', os.path.join('app', 'audit', 'predictions.db')),
+                        help='Path to the audit database')
+    parser.add_argument('--since', type=float, help='Only records at or after this Unix timestamp')
+    parser.add_argument('--until', type=float, help='Only records before this Unix timestamp')
+    parser.add_argument('--model-version', help='Only records from this model version')
+    parser.add_argument('--limit', type=int, help='Maximum number of records')
+    parser.add_argument('--format', choices=['ndjson', 'csv'], default='ndjson')
+    parser.add_argument('--output', help='Output file (defaults to stdout)')
+    args = parser.parse_args()
+
+    records = query(args.db, since=args.since, until=args.until,
+                    model_version=args.model_version, limit=args.limit)
+    if args.output:
+        with open(args.output, 'w', newline='') as out:
+            count = export(records, out, args.format)
+    else:
+        count = export(records, sys.stdout, args.format)
+    print(f"Exported {count} records", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
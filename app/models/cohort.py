@@ -0,0 +1,126 @@
+import numpy as np
+import pandas as pd
+
+# Cohort queries are answered from packed bitmaps: one bitmap per value of
+# each indexed column plus one for the target. A filter is the bitwise AND
+# of the selected value bitmaps and every aggregate is a popcount, so a query
+# never touches the rows themselves.
+
+if hasattr(np, 'bitwise_count'):
+    def _popcount(words):
+        """Number of set bits in an array of uint64 words"""
+        return int(np.bitwise_count(words).sum())
+else:
+    _BYTE_COUNTS = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+    def _popcount(words):
+        """Number of set bits in an array of uint64 words"""
+        return int(_BYTE_COUNTS[words.view(np.uint8)].sum())
+
+
+def _pack(mask):
+    """Pack a boolean row mask into little-endian uint64 words"""
+    padded = np.zeros(-(-len(mask) // 64) * 64, dtype=bool)
+    padded[:len(mask)] = mask
+    return np.packbits(padded, bitorder='little').view(np.uint64)
+
+
+def _value_key(value):
+    """Normalize a column value to the string key used in queries"""
+    if isinstance(value, (float, np.floating)) and float(value).is_integer():
+        return str(int(value))
+    return str(value)
+
+
+class CohortIndex:
+    """Bitmap index over categorical columns for fast cohort breakdowns
+
+    ``columns`` maps each indexed dimension name to a Series of categorical
+    or pre-bucketed values aligned with ``target``. Missing values are not
+    indexed, so rows with a missing value never match a filter on that column.
+    """
+
+    def __init__(self, columns, target):
+        target = np.asarray(target)
+        self.size = len(target)
+        self._all = _pack(np.ones(self.size, dtype=bool))
+        self._target = _pack(target == 1)
+        self._bitmaps = {}
+        for name, values in columns.items():
+            values = pd.Series(values).reset_index(drop=True)
+            present = values.dropna()
+            keys = present.map(_value_key)
+            bitmaps = {}
+            # Preserve category order for bucketed columns, numeric order otherwise
+            ordered = (present.cat.categories if isinstance(values.dtype, pd.CategoricalDtype)
+                       else np.sort(present.unique()))
+            for category in ordered:
+                key = _value_key(category)
+                mask = np.zeros(self.size, dtype=bool)
+                mask[keys.index[keys == key]] = True
+                bitmaps[key] = _pack(mask)
+            self._bitmaps[name] = bitmaps
+
+    @property
+    def dimensions(self):
+        """Indexed column names and their values"""
+        return {name: list(bitmaps) for name, bitmaps in self._bitmaps.items()}
+
+    def _mask(self, filters):
+        """Bitmap of rows matching every filter
+
+        ``filters`` maps a column to a value or a list of values; values of the
+        same column are ORed together and different columns are ANDed.
+        """
+        mask = self._all.copy()
+        for name, values in (filters or {}).items():
+            if name not in self._bitmaps:
+                raise ValueError(f"Unknown cohort filter: {name}")
+            if not isinstance(values, (list, tuple, set)):
+                values = [values]
+            column = self._bitmaps[name]
+            selected = np.zeros_like(mask)
+            for value in values:
+                key = _value_key(value)
+                if key not in column:
+                    raise ValueError(f"Unknown value for {name}: {value}")
+                selected |= column[key]
+            mask &= selected
+        return mask
+
+    @staticmethod
+    def _summary(count, disease_count):
+        return {
+            'count': count,
+            'disease_count': disease_count,
+            'risk_percentage': round(disease_count / count * 100, 1) if count else 0.0
+        }
+
+    def count(self, filters=None):
+        """Patient and disease counts for a cohort"""
+        mask = self._mask(filters)
+        return self._summary(_popcount(mask), _popcount(mask & self._target))
+
+    def _breakdown(self, dimension, mask, diseased):
+        if dimension not in self._bitmaps:
+            raise ValueError(f"Unknown cohort dimension: {dimension}")
+        return {
+            key: self._summary(_popcount(mask & bitmap), _popcount(diseased & bitmap))
+            for key, bitmap in self._bitmaps[dimension].items()
+        }
+
+    def breakdown(self, dimension, filters=None):
+        """Counts and disease rate per value of a dimension within a cohort"""
+        mask = self._mask(filters)
+        return self._breakdown(dimension, mask, mask & self._target)
+
+    def query(self, filters=None, dimensions=None):
+        """Cohort summary plus a breakdown for each requested dimension"""
+        dimensions = list(self._bitmaps) if dimensions is None else dimensions
+        # Filter once and reuse the cohort bitmap for every breakdown
+        mask = self._mask(filters)
+        diseased = mask & self._target
+        result = self._summary(_popcount(mask), _popcount(diseased))
+        result['breakdowns'] = {dimension: self._breakdown(dimension, mask, diseased)
+                                for dimension in dimensions}
+        return result
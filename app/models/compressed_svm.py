@@ -0,0 +1,116 @@
+import numpy as np
+
+# Reduced-set approximation of a binary RBF SVC. The support vectors are
+# clustered into a much smaller set of centers weighted by their dual
+# coefficients, and the center coefficients and intercept are refit by least
+# squares so the reduced expansion reproduces the exact decision function on
+# the training data. The result is evaluated with plain NumPy and stored as
+# an .npz file, so loading it needs neither pickle nor scikit-learn.
+
+
+class CompressedSVC:
+    """NumPy-only RBF kernel classifier with Platt-scaled probabilities"""
+
+    def __init__(self, centers, coef, intercept, gamma, prob_a, prob_b, classes,
+                 feature_names=None):
+        self.centers = np.asarray(centers)
+        self.dtype = self.centers.dtype
+        self.coef = np.asarray(coef, dtype=self.dtype)
+        self.intercept = float(intercept)
+        self.gamma = float(gamma)
+        self.prob_a = float(prob_a)
+        self.prob_b = float(prob_b)
+        self.classes_ = np.asarray(classes)
+        self.feature_names = None if feature_names is None else list(feature_names)
+        self._center_norms = np.einsum('ij,ij->i', self.centers, self.centers)
+
+    @property
+    def n_centers(self):
+        return len(self.centers)
+
+    def decision_function(self, X):
+        """Kernel expansion over the centers, same sign convention as SVC"""
+        X = np.asarray(X, dtype=self.dtype)
+        # ||x - c||^2 expanded so the heavy part is a single matrix product
+        sq_dist = (np.einsum('ij,ij->i', X, X)[:, None] + self._center_norms[None, :]
+                   - 2 * X @ self.centers.T)
+        kernel = np.exp(-self.gamma * np.maximum(sq_dist, 0))
+        return kernel @ self.coef + self.intercept
+
+    def predict_proba(self, X):
+        """Class probabilities using the SVC's Platt scaling parameters"""
+        decision = self.decision_function(X).astype(float)
+        positive = 1.0 / (1.0 + np.exp(self.prob_a * decision - self.prob_b))
+        return np.column_stack([1 - positive, positive])
+
+    def predict(self, X):
+        return self.classes_[(self.decision_function(X) > 0).astype(int)]
+
+    def save(self, path):
+        """Write the model to an .npz file"""
+        arrays = {
+            'centers': self.centers,
+            'coef': self.coef,
+            'params': np.array([self.intercept, self.gamma, self.prob_a, self.prob_b]),
+            'classes': self.classes_
+        }
+        if self.feature_names is not None:
+            arrays['feature_names'] = np.array(self.feature_names)
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        """Read a model written by ``save``"""
+        with np.load(path, allow_pickle=False) as data:
+            intercept, gamma, prob_a, prob_b = data['params']
+            feature_names = data['feature_names'].tolist() if 'feature_names' in data else None
+            return cls(data['centers'], data['coef'], intercept, gamma, prob_a, prob_b,
+                       data['classes'], feature_names)
+
+
+def _rbf(X, centers, gamma):
+    sq_dist = (np.einsum('ij,ij->i', X, X)[:, None] + np.einsum('ij,ij->i', centers, centers)[None, :]
+               - 2 * X @ centers.T)
+    return np.exp(-gamma * np.maximum(sq_dist, 0))
+
+
+def compress_svc(model, X_fit, ratio=0.2, dtype=np.float32, ridge=1e-6, random_state=42):
+    """Build a reduced-set CompressedSVC from a fitted binary RBF SVC
+
+    ``ratio`` is the fraction of support vectors kept as centers. The
+    support vectors of each class are clustered separately, weighted by the
+    size of their dual coefficients. ``X_fit`` (normally the scaled training
+    data) is where the reduced decision function is fit to the exact one.
+    """
+    from sklearn.cluster import KMeans
+
+    if model.kernel != 'rbf' or len(model.classes_) != 2:
+        raise ValueError("Only binary SVCs with an RBF kernel can be compressed")
+
+    support = np.asarray(model.support_vectors_, dtype=float)
+    dual = model.dual_coef_[0]
+    gamma = model._gamma
+    n_centers = max(2, int(round(len(support) * ratio)))
+
+    centers = []
+    for sign in (-1, 1):
+        members = support[np.sign(dual) == sign]
+        weights = np.abs(dual[np.sign(dual) == sign])
+        k = max(1, min(len(members), int(round(n_centers * len(members) / len(support)))))
+        kmeans = KMeans(n_clusters=k, n_init=4, random_state=random_state)
+        kmeans.fit(members, sample_weight=weights)
+        centers.append(kmeans.cluster_centers_)
+    centers = np.vstack(centers)
+
+    # Least-squares fit of the center coefficients and intercept to the exact decision values
+    X_fit = np.asarray(X_fit, dtype=float)
+    target = model.decision_function(X_fit)
+    design = np.hstack([_rbf(X_fit, centers, gamma), np.ones((len(X_fit), 1))])
+    gram = design.T @ design + ridge * np.eye(design.shape[1])
+    solution = np.linalg.solve(gram, design.T @ target)
+
+    feature_names = getattr(model, 'feature_names_in_', None)
+    return CompressedSVC(
+        centers.astype(dtype), solution[:-1], solution[-1], gamma,
+        np.ravel(model.probA_)[0], np.ravel(model.probB_)[0], model.classes_, feature_names
+    )
@@ -0,0 +1,166 @@
+import bisect
+import os
+import threading
+import time
+
+import numpy as np
+
+# Live inputs are compared against the training data with fixed-bin
+# histograms. Observing a prediction is one bisect and one counter increment
+# per feature plus a running mean/variance update; no raw rows are kept.
+
+CONTINUOUS_FEATURES = ['age', 'trestbps', 'chol', 'thalach', 'oldpeak']
+DISCRETE_FEATURES = ['sex', 'cp', 'fbs', 'restecg', 'exang', 'slope', 'ca', 'thal']
+MONITORED_FEATURES = CONTINUOUS_FEATURES + DISCRETE_FEATURES
+
+# Conventional PSI thresholds for moderate and significant shifts
+PSI_WARNING = 0.1
+PSI_ALERT = 0.25
+
+# PSI on a handful of inputs is noise; below this count no status is given
+MIN_OBSERVATIONS = 100
+
+# Floor for empty bins so PSI stays finite
+_EPSILON = 1e-4
+
+
+def _bin_edges(values, discrete, n_bins, extra_values=()):
+    """Inner bin edges for a feature; values outside them fall in the end bins"""
+    if discrete:
+        # One bin per level seen in training or allowed by the input ranges
+        levels = np.unique(np.concatenate([values, np.asarray(extra_values, dtype=float)]))
+        return list((levels[:-1] + levels[1:]) / 2)
+    quantiles = np.quantile(values, np.linspace(0, 1, n_bins + 1)[1:-1])
+    return list(np.unique(quantiles))
+
+
+def psi(expected, actual):
+    """Population stability index between two count histograms"""
+    p = np.maximum(expected / max(expected.sum(), 1), _EPSILON)
+    q = np.maximum(actual / max(actual.sum(), 1), _EPSILON)
+    return float(np.sum((q - p) * np.log(q / p)))
+
+
+def ks_distance(expected, actual):
+    """Largest gap between the binned cumulative distributions"""
+    p = np.cumsum(expected) / max(expected.sum(), 1)
+    q = np.cumsum(actual) / max(actual.sum(), 1)
+    return float(np.max(np.abs(p - q)))
+
+
+class DriftMonitor:
+    """Fixed-memory drift monitor for prediction inputs
+
+    Keeps a histogram per feature for the current window and for all inputs
+    since startup, plus running mean and variance. Every ``window_size``
+    observations the window is compared to the reference histograms and the
+    result is kept as the latest report. Comparisons over fewer than
+    ``min_observations`` inputs report their PSI with a ``None`` status.
+
+    State is per process: under a multi-worker server each worker monitors
+    only the requests it handled.
+    """
+
+    def __init__(self, reference_data, valid_ranges=None, n_bins=10, window_size=500,
+                 min_observations=MIN_OBSERVATIONS):
+        self.window_size = window_size
+        self.min_observations = min_observations
+        self._lock = threading.Lock()
+        self._edges = []
+        self._offsets = [0]
+        reference = []
+        for feature in MONITORED_FEATURES:
+            values = reference_data[feature].dropna().to_numpy(dtype=float)
+            discrete = feature in DISCRETE_FEATURES
+            extra = ()
+            if discrete and valid_ranges and feature in valid_ranges:
+                low, high = valid_ranges[feature]
+                extra = range(int(low), int(high) + 1)
+            edges = _bin_edges(values, discrete, n_bins, extra)
+            self._edges.append(edges)
+            self._offsets.append(self._offsets[-1] + len(edges) + 1)
+            reference.append(np.bincount(np.searchsorted(edges, values, side='right'),
+                                         minlength=len(edges) + 1))
+        self._reference = np.concatenate(reference).astype(np.int64)
+        self._reference_mean = reference_data[MONITORED_FEATURES].mean().to_numpy(dtype=float)
+        self._reference_std = reference_data[MONITORED_FEATURES].std().to_numpy(dtype=float)
+
+        size = self._offsets[-1]
+        self._window = np.zeros(size, dtype=np.int64)
+        self._total = np.zeros(size, dtype=np.int64)
+        self._count = 0
+        self._window_count = 0
+        self._mean = np.zeros(len(MONITORED_FEATURES))
+        self._m2 = np.zeros(len(MONITORED_FEATURES))
+        self._last_report = None
+
+    def observe(self, data):
+        """Record one validated input dict"""
+        positions = [self._offsets[i] + bisect.bisect_right(self._edges[i], data[feature])
+                     for i, feature in enumerate(MONITORED_FEATURES)]
+        values = np.array([data[feature] for feature in MONITORED_FEATURES], dtype=float)
+        with self._lock:
+            self._window[positions] += 1
+            self._total[positions] += 1
+            # Welford update of the running mean and variance
+            self._count += 1
+            delta = values - self._mean
+            self._mean += delta / self._count
+            self._m2 += delta * (values - self._mean)
+            self._window_count += 1
+            if self._window_count >= self.window_size:
+                self._last_report = self._compare(self._window, self._window_count)
+                self._window[:] = 0
+                self._window_count = 0
+
+    def _compare(self, counts, n):
+        """Per-feature PSI and KS distance of a histogram against the reference"""
+        features = {}
+        for i, feature in enumerate(MONITORED_FEATURES):
+            start, end = self._offsets[i], self._offsets[i + 1]
+            expected, actual = self._reference[start:end], counts[start:end]
+            feature_psi = psi(expected, actual)
+            if n < self.min_observations:
+                status = None
+            else:
+                status = ('alert' if feature_psi >= PSI_ALERT
+                          else 'warning' if feature_psi >= PSI_WARNING else 'ok')
+            features[feature] = {
+                'psi': round(feature_psi, 4),
+                'ks': round(ks_distance(expected, actual), 4),
+                'status': status
+            }
+        return {'observations': n, 'computed_at': time.time(), 'features': features}
+
+    def report(self):
+        """Latest completed window plus live comparisons for the open window and all inputs"""
+        with self._lock:
+            window = self._window.copy()
+            window_count = self._window_count
+            total = self._total.copy()
+            count = self._count
+            mean = self._mean.copy()
+            variance = self._m2 / (count - 1) if count > 1 else np.full_like(self._m2, np.nan)
+            last_report = self._last_report
+
+        summary = {
+            feature: {
+                'mean': round(float(mean[i]), 3) if count else None,
+                'std': round(float(np.sqrt(variance[i])), 3) if count > 1 else None,
+                'reference_mean': round(float(self._reference_mean[i]), 3),
+                'reference_std': round(float(self._reference_std[i]), 3)
+            }
+            for i, feature in enumerate(MONITORED_FEATURES)
+        }
+        return {
+            # Counts cover this worker process only
+            'scope': 'worker',
+            'pid': os.getpid(),
+            'observations': count,
+            'window_size': self.window_size,
+            'min_observations': self.min_observations,
+            'last_window': last_report,
+            'current_window': self._compare(window, window_count) if window_count else None,
+            'cumulative': self._compare(total, count) if count else None,
+            'summary': summary
+        }
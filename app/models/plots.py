@@ -0,0 +1,146 @@
+import io
+import base64
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+# Figures are built with the object-oriented Figure API and an Agg canvas so
+# that rendering never touches the process-global pyplot state. The render
+# functions are module-level so they can run in worker processes.
+
+PLOT_NAMES = ('age_distribution', 'correlation_heatmap', 'age_risk')
+
+
+def _new_figure(figsize):
+    """Create a standalone figure with an Agg canvas and a whitegrid axes"""
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    import seaborn as sns
+
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    with sns.axes_style('whitegrid'):
+        ax = fig.add_subplot()
+    return fig, ax
+
+
+def _figure_to_base64(fig):
+    """Convert a figure to a base64 encoded PNG"""
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', bbox_inches='tight', dpi=300)
+    return base64.b64encode(buf.getvalue()).decode('utf-8')
+
+
+def render_age_distribution(data):
+    """Age histogram split by heart disease status"""
+    import seaborn as sns
+
+    fig, ax = _new_figure((10, 6))
+    sns.histplot(data=data, x='age', hue='target', bins=20, ax=ax)
+    ax.set_title('Age Distribution by Heart Disease Status')
+    ax.set_xlabel('Age')
+    ax.set_ylabel('Count')
+    return _figure_to_base64(fig)
+
+
+def render_correlation_heatmap(corr):
+    """Annotated heatmap of a correlation matrix"""
+    import seaborn as sns
+
+    fig, ax = _new_figure((10, 8))
+    sns.heatmap(corr, annot=True, cmap='coolwarm', fmt='.2f', ax=ax)
+    ax.set_title('Feature Correlation Heatmap')
+    return _figure_to_base64(fig)
+
+
+def render_age_risk(age_risk):
+    """Bar chart of disease rate per age group"""
+    fig, ax = _new_figure((10, 6))
+    ax.bar([str(k) for k in age_risk.index], age_risk.to_numpy())
+    ax.set_title('Heart Disease Risk by Age Group')
+    ax.set_xlabel('Age Group')
+    ax.set_ylabel('Risk Percentage')
+    ax.tick_params(axis='x', labelrotation=45)
+    return _figure_to_base64(fig)
+
+
+RENDERERS = {
+    'age_distribution': render_age_distribution,
+    'correlation_heatmap': render_correlation_heatmap,
+    'age_risk': render_age_risk
+}
+
+
+def render_plot(name, data):
+    """Render a single named plot from its input data"""
+    return RENDERERS[name](data)
+
+
+def _init_worker():
+    """Select the Agg backend before anything imports pyplot"""
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+class PlotRenderer:
+    """Renders dashboard plots in parallel in a dedicated process pool
+
+    Rendering is started with ``submit`` and each figure can be polled with
+    ``get`` once it is needed. Results are kept per data version so a plot is
+    only rendered again after the underlying dataset changes.
+    """
+
+    def __init__(self, max_workers=len(PLOT_NAMES)):
+        self._max_workers = max_workers
+        self._executor = None
+        self._lock = threading.Lock()
+        self._version = None
+        self._futures = {}
+
+    def _get_executor(self):
+        """Start the worker pool on first use"""
+        if self._executor is None:
+            # spawn avoids forking a process that may be running request threads
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._max_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker
+            )
+        return self._executor
+
+    def submit(self, version, get_plot_data):
+        """Start rendering every plot unless this version is already queued
+
+        ``get_plot_data`` is only called when rendering is actually needed and
+        must return a dict mapping each plot name to its input data.
+        """
+        with self._lock:
+            if version == self._version and not any(
+                    f.done() and f.exception() is not None for f in self._futures.values()):
+                return
+            plot_data = get_plot_data()
+            executor = self._get_executor()
+            self._futures = {name: executor.submit(render_plot, name, plot_data[name])
+                             for name in PLOT_NAMES}
+            self._version = version
+
+    def get(self, name):
+        """Return the base64 PNG for a plot, or None while it is still rendering
+
+        Raises KeyError for unknown or never submitted plots and re-raises any
+        error that occurred while rendering.
+        """
+        with self._lock:
+            future = self._futures[name]
+        if not future.done():
+            return None
+        return future.result()
+
+    def shutdown(self):
+        """Stop the worker pool"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            self._version = None
+            self._futures = {}
@@ -7,7 +7,10 @@ from sklearn.svm import SVC
 from sklearn.utils.class_weight import compute_class_weight
 import joblib
 import os
+import time
+import warnings
 from feature_engineering import prepare_features
+from compressed_svm import compress_svc
 
 def load_and_preprocess_data():
     """Load and preprocess the combined heart disease dataset"""
@@ -81,6 +84,52 @@ def evaluate_model(model, X_test, y_test):
     
     return accuracy, roc_auc
 
+def compress_model(model, X_train, X_test, y_test, ratio=0.2, dtype=np.float32):
+    """Build a reduced support-vector model and compare it with the exact one"""
+    compressed = compress_svc(model, X_train, ratio=ratio, dtype=dtype)
+    
+    exact_proba = model.predict_proba(X_test)[:, 1]
+    compressed_proba = compressed.predict_proba(X_test)[:, 1]
+    exact_pred = (exact_proba > 0.5).astype(int)
+    compressed_pred = (compressed_proba > 0.5).astype(int)
+    
+    # Time single-row inference, which is what /predict does. /predict passes
+    # the scaler's ndarray to either model, so both are timed on ndarrays
+    X_test_array = X_test.to_numpy()
+    row = X_test_array[:1]
+    repeats = 200
+    with warnings.catch_warnings():
+        # The SVC was fitted on a DataFrame and warns about missing feature names
+        warnings.simplefilter('ignore', UserWarning)
+        start = time.perf_counter()
+        for _ in range(repeats):
+            model.predict_proba(row)
+        exact_time = (time.perf_counter() - start) / repeats
+        start = time.perf_counter()
+        model.predict_proba(X_test_array)
+        exact_batch_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for _ in range(repeats):
+        compressed.predict_proba(row)
+    compressed_time = (time.perf_counter() - start) / repeats
+    start = time.perf_counter()
+    compressed.predict_proba(X_test_array)
+    compressed_batch_time = time.perf_counter() - start
+    
+    print("\nSupport Vector Compression:")
+    print(f"Support vectors: {len(model.support_vectors_)} -> {compressed.n_centers} centers ({np.dtype(dtype).name})")
+    print(f"Accuracy: {accuracy_score(y_test, exact_pred):.4f} -> {accuracy_score(y_test, compressed_pred):.4f}")
+    print(f"ROC AUC: {roc_auc_score(y_test, exact_proba):.4f} -> {roc_auc_score(y_test, compressed_proba):.4f}")
+    print(f"Prediction agreement: {(exact_pred == compressed_pred).mean():.4f}")
+    print(f"Max probability difference: {np.abs(exact_proba - compressed_proba).max():.4f}")
+    print(f"predict_proba per row: {exact_time * 1e6:.0f} us -> {compressed_time * 1e6:.0f} us "
+          f"({exact_time / compressed_time:.1f}x faster)")
+    print(f"predict_proba on {len(X_test)} rows: {exact_batch_time * 1e3:.1f} ms -> {compressed_batch_time * 1e3:.1f} ms "
+          f"({exact_batch_time / compressed_batch_time:.1f}x faster)")
+    
+    return compressed
+
 def main():
     print("Loading and preprocessing data...")
     X_train, X_test, y_train, y_test, class_weight_dict = load_and_preprocess_data()
@@ -96,6 +145,13 @@ def main():
     joblib.dump(model, model_path)
     print(f"\nModel saved to {model_path}")
     
+    # Build and save the compressed model served with MODEL_VARIANT=compressed
+    print("\nCompressing support vectors...")
+    compressed = compress_model(model, X_train, X_test, y_test)
+    compressed_path = os.path.join('app', 'models', 'heart_disease_model_compressed.npz')
+    compressed.save(compressed_path)
+    print(f"Compressed model saved to {compressed_path}")
+    
     # Perform cross-validation
     print("\nPerforming 5-fold cross-validation...")
     cv_scores = cross_val_score(model, X_train, y_train, cv=5, scoring='roc_auc')
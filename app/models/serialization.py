@@ -0,0 +1,129 @@
+import gzip
+import hashlib
+import json
+import threading
+
+import numpy as np
+from flask import Response
+
+# orjson and brotli are optional; fall back to the standard library when missing
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Payloads smaller than this are not worth compressing
+MIN_COMPRESS_SIZE = 1024
+
+
+def _default(obj):
+    """Convert NumPy values that the json module cannot handle"""
+    if isinstance(obj, np.integer):
+        return int(obj)
+    if isinstance(obj, np.floating):
+        return float(obj)
+    if isinstance(obj, np.bool_):
+        return bool(obj)
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj):
+    """Serialize an object to compact JSON bytes, handling NumPy types natively"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default,
+                            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=_default, separators=(',', ':')).encode('utf-8')
+
+
+def choose_encoding(accept_encoding):
+    """Pick the best supported content encoding from an Accept-Encoding header"""
+    accepted = {part.split(';')[0].strip().lower() for part in (accept_encoding or '').split(',')}
+    if brotli is not None and 'br' in accepted:
+        return 'br'
+    if 'gzip' in accepted:
+        return 'gzip'
+    return None
+
+
+def compress(body, encoding):
+    """Compress a response body with the given content encoding"""
+    if encoding == 'br':
+        return brotli.compress(body)
+    if encoding == 'gzip':
+        return gzip.compress(body, compresslevel=6)
+    return body
+
+
+def json_response(payload, status=200):
+    """Build a JSON response from a payload without going through jsonify"""
+    return Response(dumps(payload), status=status, mimetype='application/json')
+
+
+class SerializedCache:
+    """Byte-level cache of a serialized JSON body keyed by a data version
+
+    The body is encoded once per version and each compressed variant is
+    produced lazily the first time a client asks for it. Requests carrying a
+    matching ``If-None-Match`` header are answered with 304 Not Modified.
+    """
+
+    def __init__(self, build_payload, get_version):
+        self._build_payload = build_payload
+        self._get_version = get_version
+        self._lock = threading.Lock()
+        self._version = None
+        self._etag = None
+        self._variants = {}
+
+    def _refresh(self):
+        """Rebuild the cached body if the data version has changed"""
+        version = self._get_version()
+        if version == self._version and self._etag is not None:
+            return
+        body = dumps(self._build_payload())
+        self._etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+        self._variants = {None: body}
+        self._version = version
+
+    def get(self, encoding=None):
+        """Return (etag, body, encoding) for the requested content encoding
+
+        Each content coding is a different representation, so compressed
+        bodies get the identity ETag with the coding appended.
+        """
+        with self._lock:
+            self._refresh()
+            body = self._variants[None]
+            if encoding is None or len(body) < MIN_COMPRESS_SIZE:
+                return self._etag, body, None
+            if encoding not in self._variants:
+                self._variants[encoding] = compress(body, encoding)
+            return f"{self._etag}-{encoding}", self._variants[encoding], encoding
+
+    def invalidate(self):
+        """Drop the cached body so the next request re-encodes it"""
+        with self._lock:
+            self._version = None
+            self._etag = None
+            self._variants = {}
+
+    def make_response(self, request):
+        """Serve the cached body for a Flask request with ETag and compression"""
+        etag, body, encoding = self.get(choose_encoding(request.headers.get('Accept-Encoding')))
+        if request.if_none_match.contains_weak(etag):
+            response = Response(status=304)
+        else:
+            response = Response(body, mimetype='application/json')
+            if encoding is not None:
+                response.headers['Content-Encoding'] = encoding
+        response.set_etag(etag)
+        response.headers['Vary'] = 'Accept-Encoding'
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
@@ -0,0 +1,279 @@
+import atexit
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# Every test runs over all features at once: group comparisons use scipy's
+# axis support on the full feature matrix, chi-square statistics come from a
+# single one-hot contingency product, and correlations with the target are
+# one set of matrix products. Bootstrap replicates are drawn as multinomial
+# row weights so each batch of resamples is again just matrix products.
+
+CONTINUOUS_FEATURES = ['age', 'trestbps', 'chol', 'thalach', 'oldpeak']
+CATEGORICAL_FEATURES = ['sex', 'cp', 'fbs', 'restecg', 'exang', 'slope', 'ca', 'thal']
+
+# Bootstrap replicates are drawn in seeded batches of this size
+BATCH_SIZE = 100
+# Replicates times rows below which the bootstrap stays in-process
+PARALLEL_MIN_WORK = 20_000_000
+
+# Results per (dataset version, parameters), and a lock per key being computed
+_cache = {}
+_cache_lock = threading.Lock()
+_key_locks = {}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def correlation_with_target(X, y):
+    """Pearson correlation of every column of X with y, with pairwise NaN removal"""
+    return _weighted_correlation(np.ones((1, len(y))), X, y)[0]
+
+
+def _weighted_correlation(weights, X, y):
+    """Correlation of each column of X with y for every row of a weight matrix
+
+    ``weights`` has shape (batches, rows); a row of ones gives the plain
+    correlation and multinomial counts give bootstrap replicates.
+    """
+    X = np.asarray(X, dtype=float)
+    y = np.asarray(y, dtype=float)
+    valid = ~np.isnan(X) & ~np.isnan(y)[:, None]
+    X0 = np.where(valid, X, 0.0)
+    y0 = np.where(np.isnan(y), 0.0, y)[:, None] * valid
+
+    n = weights @ valid
+    sx = weights @ X0
+    sy = weights @ y0
+    sxx = weights @ (X0 * X0)
+    syy = weights @ (y0 * y0)
+    sxy = weights @ (X0 * y0)
+
+    cov = n * sxy - sx * sy
+    var = (n * sxx - sx * sx) * (n * syy - sy * sy)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return cov / np.sqrt(var)
+
+
+def _one_hot(data, features):
+    """Indicator matrix over every level of every categorical feature"""
+    blocks, levels = [], []
+    for feature in features:
+        values = data[feature].to_numpy()
+        feature_levels = np.unique(values[~pd.isnull(values)])
+        blocks.append(values[:, None] == feature_levels[None, :])
+        levels.append(feature_levels)
+    return np.hstack(blocks).astype(float), levels
+
+
+def chi_square_tests(indicators, levels, y):
+    """Chi-square test of independence between each categorical feature and y
+
+    Matches scipy.stats.chi2_contingency, including Yates' correction for
+    features with one degree of freedom.
+    """
+    from scipy import stats
+
+    y = np.asarray(y, dtype=float)
+    observed = indicators.T @ np.column_stack([1 - y, y])
+    sizes = np.array([len(l) for l in levels])
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+
+    # Expected counts use each feature's own total, which excludes missing values
+    feature_totals = np.add.reduceat(observed, starts, axis=0)
+    block_totals = np.repeat(feature_totals, sizes, axis=0)
+    row_totals = observed.sum(axis=1, keepdims=True)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        expected = row_totals * block_totals / block_totals.sum(axis=1, keepdims=True)
+
+    dof = sizes - 1
+    diff = np.abs(observed - expected)
+    yates = np.repeat(dof == 1, sizes)[:, None]
+    diff = np.where(yates, diff - np.minimum(0.5, diff), diff)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        contributions = np.where(expected > 0, diff ** 2 / expected, 0.0)
+    statistic = np.add.reduceat(contributions.sum(axis=1), starts)
+    return statistic, dof, stats.chi2.sf(statistic, dof)
+
+
+def group_tests(X, y):
+    """Student t-test and Mann-Whitney U for every column of X between y groups"""
+    from scipy import stats
+
+    disease, healthy = X[y == 1], X[y == 0]
+    t_stat, t_p = stats.ttest_ind(disease, healthy, axis=0, nan_policy='omit')
+    u_stat, u_p = stats.mannwhitneyu(disease, healthy, axis=0, nan_policy='omit',
+                                     method='asymptotic')
+    return {
+        'disease_mean': np.nanmean(disease, axis=0),
+        'healthy_mean': np.nanmean(healthy, axis=0),
+        't_statistic': np.asarray(t_stat),
+        't_p_value': np.asarray(t_p),
+        'u_statistic': np.asarray(u_stat),
+        'u_p_value': np.asarray(u_p)
+    }
+
+
+def _bootstrap_batches(X, y, indicators, batches):
+    """Draw bootstrap replicates of disease rates and correlations
+
+    ``batches`` is a list of (size, seed sequence) pairs; each batch is drawn
+    from its own generator, so a batch gives the same replicates whichever
+    process computes it.
+    """
+    n = len(y)
+    rates, level_rates, correlations = [], [], []
+    for size, seed_seq in batches:
+        rng = np.random.default_rng(seed_seq)
+        # Each row counts how often every patient was drawn in one resample
+        weights = rng.multinomial(n, np.full(n, 1.0 / n), size=size).astype(float)
+        rates.append(weights @ y / n)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            level_rates.append((weights @ (indicators * y[:, None])) / (weights @ indicators))
+        correlations.append(_weighted_correlation(weights, X, y))
+    return np.concatenate(rates), np.vstack(level_rates), np.vstack(correlations)
+
+
+def _get_executor():
+    """Process pool shared by every bootstrap run, started on first use"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=os.cpu_count() or 1,
+                                            mp_context=multiprocessing.get_context('spawn'))
+            atexit.register(_executor.shutdown)
+        return _executor
+
+
+def bootstrap(X, y, indicators, n_boot=1000, seed=42, n_jobs=None):
+    """Bootstrap replicates in fixed-size seeded batches
+
+    Every batch of ``BATCH_SIZE`` replicates gets its own child of a
+    SeedSequence, so results depend only on ``seed`` and ``n_boot``. Runs
+    large enough to outweigh the inter-process overhead are spread over a
+    shared process pool, ``n_jobs`` tasks at a time.
+    """
+    n_batches = -(-n_boot // BATCH_SIZE)
+    seeds = np.random.SeedSequence(seed).spawn(n_batches)
+    batches = [(min(BATCH_SIZE, n_boot - i * BATCH_SIZE), s) for i, s in enumerate(seeds)]
+
+    n_jobs = max(1, min(n_jobs or os.cpu_count() or 1, n_batches))
+    if n_jobs == 1 or n_boot * len(y) < PARALLEL_MIN_WORK:
+        results = [_bootstrap_batches(X, y, indicators, batches)]
+    else:
+        # Contiguous groups keep the replicates in batch order
+        bounds = np.linspace(0, n_batches, n_jobs + 1).astype(int)
+        executor = _get_executor()
+        futures = [executor.submit(_bootstrap_batches, X, y, indicators, batches[lo:hi])
+                   for lo, hi in zip(bounds[:-1], bounds[1:])]
+        results = [f.result() for f in futures]
+
+    return tuple(np.concatenate(parts) for parts in zip(*results))
+
+
+def _interval(estimate, replicates, confidence):
+    """Percentile confidence interval for each column of the replicates"""
+    alpha = (1 - confidence) / 2 * 100
+    lower, upper = np.nanpercentile(replicates, [alpha, 100 - alpha], axis=0)
+    return estimate, lower, upper
+
+
+def _round(value, digits=4):
+    """JSON-friendly float, with NaN as None and no rounding when digits is None"""
+    if value is None or np.isnan(value):
+        return None
+    return float(value) if digits is None else round(float(value), digits)
+
+
+def run_test_suite(data, n_boot=1000, confidence=0.95, seed=42, n_jobs=None, alpha=0.05):
+    """Run the full statistical testing suite on a dataset with a binary target"""
+    y = data['target'].to_numpy(dtype=float)
+    X = data[CONTINUOUS_FEATURES].to_numpy(dtype=float)
+    all_features = CONTINUOUS_FEATURES + CATEGORICAL_FEATURES
+    X_all = data[all_features].to_numpy(dtype=float)
+    indicators, levels = _one_hot(data, CATEGORICAL_FEATURES)
+
+    groups = group_tests(X, y)
+    chi2, dof, chi2_p = chi_square_tests(indicators, levels, y)
+    correlations = correlation_with_target(X_all, y)
+
+    boot_rates, boot_level_rates, boot_corr = bootstrap(X_all, y, indicators, n_boot=n_boot,
+                                                        seed=seed, n_jobs=n_jobs)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        level_rates = (indicators.T @ y) / indicators.sum(axis=0)
+    rate, rate_lo, rate_hi = _interval(y.mean(), boot_rates, confidence)
+    level_rate, level_lo, level_hi = _interval(level_rates, boot_level_rates, confidence)
+    corr, corr_lo, corr_hi = _interval(correlations, boot_corr, confidence)
+
+    continuous = {
+        feature: {
+            'disease_mean': _round(groups['disease_mean'][i]),
+            'healthy_mean': _round(groups['healthy_mean'][i]),
+            't_statistic': _round(groups['t_statistic'][i]),
+            't_p_value': _round(groups['t_p_value'][i], None),
+            'u_statistic': _round(groups['u_statistic'][i]),
+            'u_p_value': _round(groups['u_p_value'][i], None),
+            'significant': bool(groups['t_p_value'][i] < alpha)
+        }
+        for i, feature in enumerate(CONTINUOUS_FEATURES)
+    }
+
+    categorical = {
+        feature: {
+            'statistic': _round(chi2[i]),
+            'dof': int(dof[i]),
+            'p_value': _round(chi2_p[i], None),
+            'significant': bool(chi2_p[i] < alpha)
+        }
+        for i, feature in enumerate(CATEGORICAL_FEATURES)
+    }
+
+    disease_rates = {'overall': {'estimate': _round(rate), 'lower': _round(rate_lo),
+                                 'upper': _round(rate_hi)}}
+    offset = 0
+    for feature, feature_levels in zip(CATEGORICAL_FEATURES, levels):
+        disease_rates[feature] = {}
+        for level in feature_levels:
+            key = str(int(level)) if float(level).is_integer() else str(level)
+            disease_rates[feature][key] = {
+                'estimate': _round(level_rate[offset]),
+                'lower': _round(level_lo[offset]),
+                'upper': _round(level_hi[offset])
+            }
+            offset += 1
+
+    return {
+        'continuous': continuous,
+        'categorical': categorical,
+        'correlations': {
+            feature: {'estimate': _round(corr[i]), 'lower': _round(corr_lo[i]),
+                      'upper': _round(corr_hi[i])}
+            for i, feature in enumerate(all_features)
+        },
+        'disease_rates': disease_rates,
+        'bootstrap': {'n_boot': n_boot, 'confidence': confidence, 'seed': seed}
+    }
+
+
+def get_test_suite(data, version, **params):
+    """Cached run_test_suite keyed by dataset version and parameters"""
+    key = (version, tuple(sorted(params.items())))
+    with _cache_lock:
+        if key in _cache:
+            return _cache[key]
+        key_lock = _key_locks.setdefault(key, threading.Lock())
+    # Concurrent cold requests for the same key wait for a single computation
+    with key_lock:
+        with _cache_lock:
+            if key in _cache:
+                return _cache[key]
+        result = run_test_suite(data, **params)
+        with _cache_lock:
+            _cache[key] = result
+            _key_locks.pop(key, None)
+    return result
@@ -1,13 +1,10 @@
+import threading
+
 import pandas as pd
 import numpy as np
-from sklearn.metrics import confusion_matrix, classification_report
-import matplotlib
-matplotlib.use('Agg')  # Set backend to Agg before importing pyplot
-import matplotlib.pyplot as plt
-import seaborn as sns
-import io
-import base64
-from scipy import stats
+
+# scipy and the plotting stack are imported lazily by the methods that need
+# them so that loading the statistics module stays cheap
 
 class HeartDiseaseStatistics:
     def __init__(self, data_path='models/data/heart_disease_combined.csv'):
@@ -19,9 +16,10 @@ class HeartDiseaseStatistics:
             self.data['age_group'] = pd.cut(self.data['age'], 
                                           bins=[0, 40, 50, 60, 70, 100],
                                           labels=['<40', '40-50', '50-60', '60-70', '>70'])
-            # Set style for plots
-            plt.style.use('default')
-            sns.set_theme(style="whitegrid")
+            # Content hash identifying this version of the dataset for caching
+            self.data_version = int(pd.util.hash_pandas_object(self.data, index=False).sum())
+            self._cohort_index = None
+            self._cohort_index_lock = threading.Lock()
         except Exception as e:
             print(f"Error initializing HeartDiseaseStatistics: {str(e)}")
             raise
@@ -114,13 +112,14 @@ class HeartDiseaseStatistics:
                 'thal': 'Thalassemia'
             }
             
-            # Calculate correlations for all features
-            correlations = {}
-            for feature in self.data.columns:
-                if feature != 'target' and feature != 'age_group':
-                    correlation = self.data[feature].corr(self.data['target'])
-                    feature_name = feature_names.get(feature, feature)
-                    correlations[feature_name] = round(correlation, 3)
+            # Calculate correlations for all features with one set of matrix products
+            from models.statistical_tests import correlation_with_target
+            
+            features = [c for c in self.data.columns if c not in ('target', 'age_group')]
+            values = correlation_with_target(self.data[features].to_numpy(dtype=float), 
+                                             self.data['target'].to_numpy())
+            correlations = {feature_names.get(feature, feature): round(float(value), 3)
+                            for feature, value in zip(features, values)}
             
             # Sort correlations by absolute value
             correlations = dict(sorted(correlations.items(), 
@@ -135,6 +134,8 @@ class HeartDiseaseStatistics:
     def get_statistical_tests(self):
         """Perform statistical tests for significant differences"""
         try:
+            from scipy import stats
+            
             tests = {}
             
             # T-test for age between disease and no disease groups
@@ -163,55 +164,90 @@ class HeartDiseaseStatistics:
             print(f"Error in get_statistical_tests: {str(e)}")
             return None
     
-    def _save_plot_to_base64(self, fig):
-        """Convert matplotlib figure to base64 string"""
+    def get_test_suite(self, **params):
+        """Run the full statistical testing suite, cached per dataset version"""
         try:
-            buf = io.BytesIO()
-            fig.savefig(buf, format='png', bbox_inches='tight', dpi=300)
-            plt.close(fig)
-            buf.seek(0)
-            return base64.b64encode(buf.getvalue()).decode('utf-8')
+            from models.statistical_tests import get_test_suite
+            
+            return get_test_suite(self.data, self.data_version, **params)
         except Exception as e:
-            print(f"Error in _save_plot_to_base64: {str(e)}")
+            print(f"Error in get_test_suite: {str(e)}")
             return None
     
+    def get_cohort_index(self):
+        """Bitmap index over the categorical and bucketed columns, built on first use"""
+        with self._cohort_index_lock:
+            if self._cohort_index is None:
+                from models.cohort import CohortIndex
+            
+                bp_range = pd.cut(self.data['trestbps'], 
+                                  bins=[0, 120, 140, 160, 200],
+                                  labels=['Normal', 'Prehypertension', 'Stage 1', 'Stage 2'])
+                columns = {
+                    'age_group': self.data['age_group'],
+                    'sex': self.data['sex'],
+                    'cp': self.data['cp'],
+                    'bp_range': bp_range,
+                    'fbs': self.data['fbs'],
+                    'restecg': self.data['restecg'],
+                    'exang': self.data['exang'],
+                    'slope': self.data['slope'],
+                    'ca': self.data['ca'],
+                    'thal': self.data['thal']
+                }
+                self._cohort_index = CohortIndex(columns, self.data['target'])
+            return self._cohort_index
+    
+    def get_plot_data(self):
+        """Collect the small inputs each dashboard plot is rendered from"""
+        numeric_cols = ['age', 'trestbps', 'chol', 'thalach', 'oldpeak', 'target']
+        return {
+            'age_distribution': self.data[['age', 'target']].copy(),
+            'correlation_heatmap': self.data[numeric_cols].corr(),
+            'age_risk': self.data.groupby('age_group', observed=False)['target'].mean() * 100
+        }
+
+    def get_chart_data(self, bins=20):
+        """Aggregates behind each dashboard chart, for client-side rendering"""
+        try:
+            plot_data = self.get_plot_data()
+
+            # Age histogram with shared bin edges for both target classes
+            ages = self.data['age'].to_numpy()
+            target = self.data['target'].to_numpy()
+            edges = np.histogram_bin_edges(ages, bins=bins)
+            healthy_counts = np.histogram(ages[target == 0], bins=edges)[0]
+            disease_counts = np.histogram(ages[target == 1], bins=edges)[0]
+
+            corr = plot_data['correlation_heatmap']
+            age_risk = plot_data['age_risk']
+
+            return {
+                'age_distribution': {
+                    'bin_edges': np.round(edges, 1),
+                    'healthy': healthy_counts,
+                    'disease': disease_counts
+                },
+                'correlation_heatmap': {
+                    'features': corr.columns.tolist(),
+                    'matrix': np.round(corr.to_numpy(), 2)
+                },
+                'age_risk': {
+                    'groups': [str(k) for k in age_risk.index],
+                    'risk_percentage': np.round(age_risk.fillna(0).to_numpy(), 1)
+                }
+            }
+        except Exception as e:
+            print(f"Error in get_chart_data: {str(e)}")
+            return None
+
     def generate_plots(self):
-        """Generate visualization plots"""
+        """Generate visualization plots in the current process"""
         try:
-            plots = {}
-            
-            # Age distribution plot
-            plt.clf()  # Clear any existing plots
-            fig_age = plt.figure(figsize=(10, 6))
-            sns.histplot(data=self.data, x='age', hue='target', bins=20)
-            plt.title('Age Distribution by Heart Disease Status')
-            plt.xlabel('Age')
-            plt.ylabel('Count')
-            plots['age_distribution'] = self._save_plot_to_base64(fig_age)
-            plt.close(fig_age)
-            
-            # Correlation heatmap
-            plt.clf()
-            fig_corr = plt.figure(figsize=(10, 8))
-            numeric_cols = ['age', 'trestbps', 'chol', 'thalach', 'oldpeak', 'target']
-            sns.heatmap(self.data[numeric_cols].corr(), annot=True, cmap='coolwarm', fmt='.2f')
-            plt.title('Feature Correlation Heatmap')
-            plots['correlation_heatmap'] = self._save_plot_to_base64(fig_corr)
-            plt.close(fig_corr)
-            
-            # Risk by age group
-            plt.clf()
-            fig_risk = plt.figure(figsize=(10, 6))
-            age_risk = self.data.groupby('age_group')['target'].mean() * 100
-            age_risk.plot(kind='bar')
-            plt.title('Heart Disease Risk by Age Group')
-            plt.xlabel('Age Group')
-            plt.ylabel('Risk Percentage')
-            plt.xticks(rotation=45)
-            plots['age_risk'] = self._save_plot_to_base64(fig_risk)
-            plt.close(fig_risk)
-            
-            return plots
+            from models.plots import render_plot
+            
+            return {name: render_plot(name, data) 
+                    for name, data in self.get_plot_data().items()}
         except Exception as e:
             print(f"Error in generate_plots: {str(e)}")
-            return None
\ No newline at end of file
+            return None
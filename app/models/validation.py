@@ -0,0 +1,196 @@
+import numpy as np
+
+# Schema-driven parsing and validation of prediction inputs. Form, JSON and
+# columnar inputs are all turned into columns, converted to a typed record
+# array in one pass per field, and checked with array comparisons over every
+# row at once. Problems are reported as a compact code per cell, and messages
+# are only built for the cells that failed.
+
+# Define valid ranges for each feature
+VALID_RANGES = {
+    'age': (20, 100),
+    'sex': (0, 1),
+    'cp': (0, 3),
+    'trestbps': (80, 200),
+    'chol': (100, 600),
+    'fbs': (0, 1),
+    'restecg': (0, 2),
+    'thalach': (60, 220),
+    'exang': (0, 1),
+    'oldpeak': (0, 6.2),
+    'slope': (0, 2),
+    'ca': (0, 3),
+    'thal': (1, 3)
+}
+
+VALID_RANGES_MIN = {k: v[0] for k, v in VALID_RANGES.items()}
+VALID_RANGES_MAX = {k: v[1] for k, v in VALID_RANGES.items()}
+
+# Field order and types of a parsed input record
+FIELDS = list(VALID_RANGES)
+FLOAT_FIELDS = {'oldpeak'}
+RECORD_DTYPE = np.dtype([(f, np.float64 if f in FLOAT_FIELDS else np.int64) for f in FIELDS])
+
+# Per-cell error codes
+OK = 0
+MISSING = 1
+INVALID_FORMAT = 2
+OUT_OF_RANGE = 3
+
+_MIN = np.array([VALID_RANGES_MIN[f] for f in FIELDS], dtype=float)
+_MAX = np.array([VALID_RANGES_MAX[f] for f in FIELDS], dtype=float)
+
+
+def _message(field, code):
+    """Human readable message for one failed cell"""
+    if code == MISSING:
+        return f"{field} is required"
+    if code == INVALID_FORMAT:
+        return f"{field} must be {'a number' if field in FLOAT_FIELDS else 'an integer'}"
+    return f"{field} must be between {VALID_RANGES_MIN[field]} and {VALID_RANGES_MAX[field]}"
+
+
+def _to_float(values):
+    """Convert a column to floats; returns the array and a mask of unparseable cells"""
+    try:
+        converted = np.asarray(values, dtype=float)
+        # Nested lists convert too, but a cell must be a single value
+        if converted.ndim == 1:
+            return converted, None
+    except (TypeError, ValueError):
+        pass
+    # Slow path only when the column contains something that is not a number
+    converted = np.full(len(values), np.nan)
+    bad = np.zeros(len(values), dtype=bool)
+    for i, value in enumerate(values):
+        if value is None or (isinstance(value, str) and not value.strip()):
+            continue
+        try:
+            converted[i] = float(value)
+        except (TypeError, ValueError):
+            bad[i] = True
+    return converted, bad
+
+
+class ValidationResult:
+    """Parsed records plus a per-cell error code matrix
+
+    ``records`` is a structured array with ``RECORD_DTYPE``; cells that failed
+    to parse, and fields that were not supplied, hold 0. ``errors`` has one
+    uint8 code per row and field. ``fields`` lists the supplied fields; when
+    parsed with ``required=False`` it may be a subset of ``FIELDS``, and the
+    records are then partial.
+    """
+
+    def __init__(self, records, errors, fields=FIELDS):
+        self.records = records
+        self.errors = errors
+        self.fields = list(fields)
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def row_valid(self):
+        """Boolean mask of rows without any error"""
+        return ~self.errors.any(axis=1)
+
+    @property
+    def valid(self):
+        return not self.errors.any()
+
+    def messages(self):
+        """Per-cell errors as a list of {'row', 'field', 'code', 'message'} dicts"""
+        rows, cols = np.nonzero(self.errors)
+        return [
+            {'row': int(r), 'field': FIELDS[c], 'code': int(self.errors[r, c]),
+             'message': _message(FIELDS[c], self.errors[r, c])}
+            for r, c in zip(rows, cols)
+        ]
+
+    def to_dicts(self):
+        """Records as dicts of native Python numbers, with supplied fields only"""
+        if len(self.fields) == len(FIELDS):
+            return [dict(zip(FIELDS, row)) for row in self.records.tolist()]
+        return [dict(zip(self.fields, row)) for row in self.records[self.fields].tolist()]
+
+
+def parse_columns(columns, required=True):
+    """Parse and validate a mapping of field name to a sequence of raw values
+
+    Values may be numbers, NumPy scalars or numeric strings. Fields absent
+    from ``columns`` are reported as missing when ``required`` is true and
+    ignored otherwise.
+    """
+    lengths = {len(v) for v in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError("All input columns must have the same length")
+    n_rows = lengths.pop() if lengths else 0
+    # Work field-major so every per-field operation runs on contiguous memory
+    errors = np.zeros((len(FIELDS), n_rows), dtype=np.uint8)
+    values = np.zeros((len(FIELDS), n_rows))
+    present = np.ones((len(FIELDS), 1), dtype=bool)
+
+    for j, field in enumerate(FIELDS):
+        if field not in columns:
+            present[j] = False
+            if required:
+                errors[j] = MISSING
+            continue
+        column, bad = _to_float(columns[field])
+        code = np.where(np.isnan(column), MISSING, OK).astype(np.uint8)
+        if field not in FLOAT_FIELDS:
+            with np.errstate(invalid='ignore'):
+                code[np.isfinite(column) & (column != np.floor(column))] = INVALID_FORMAT
+        if bad is not None:
+            code[bad] = INVALID_FORMAT
+        errors[j] = code
+        values[j] = column
+
+    # Range checks for every row and field at once
+    parsed = (errors == OK) & present
+    with np.errstate(invalid='ignore'):
+        out_of_range = parsed & ((values < _MIN[:, None]) | (values > _MAX[:, None]))
+    errors[out_of_range] = OUT_OF_RANGE
+
+    values[errors != OK] = 0
+    records = np.rec.fromarrays(values, dtype=RECORD_DTYPE).view(np.ndarray)
+    errors = np.ascontiguousarray(errors.T)
+    return ValidationResult(records, errors, [f for f in FIELDS if f in columns])
+
+
+def parse_records(records, required=True):
+    """Parse a list of input dicts"""
+    fields = FIELDS if required else [f for f in FIELDS if any(f in r for r in records)]
+    return parse_columns({f: [r.get(f) for r in records] for f in fields}, required=required)
+
+
+def parse_form(form):
+    """Parse a single submitted form (any mapping with ``get``)"""
+    return parse_columns({f: [form.get(f)] for f in FIELDS})
+
+
+def parse_json(payload):
+    """Parse a JSON payload: one record, a list of records, or columns of lists"""
+    if isinstance(payload, list):
+        if not all(isinstance(record, dict) for record in payload):
+            raise ValueError("Expected a JSON object or a list of objects")
+        return parse_records(payload)
+    if isinstance(payload, dict):
+        if payload and all(isinstance(v, list) for v in payload.values()):
+            return parse_columns(payload)
+        return parse_records([payload])
+    raise ValueError("Expected a JSON object or a list of objects")
+
+
+def validate_input(data):
+    """Validate input data against defined ranges"""
+    errors = []
+    for feature, value in data.items():
+        if feature in VALID_RANGES:
+            min_val, max_val = VALID_RANGES[feature]
+            # NumPy scalars count as numbers too
+            if (not isinstance(value, (int, float, np.integer, np.floating))
+                    or value < min_val or value > max_val):
+                errors.append(f"{feature} must be between {min_val} and {max_val}")
+    return errors
@@ -428,6 +428,104 @@ async function loadStatistics() {
     }
 }
 
+// Interactive charts drawn client-side from compact aggregates
+const plotlyLayout = {
+    margin: { t: 20, r: 20, b: 50, l: 50 },
+    height: 300
+};
+
+async function loadChartData() {
+    if (typeof Plotly === 'undefined') {
+        showChartsUnavailable('Charts unavailable');
+        return;
+    }
+    
+    try {
+        const response = await fetch('/api/chart-data');
+        const data = await response.json();
+        
+        if (data.status === 'success') {
+            createAgeDistributionPlot(data.charts.age_distribution);
+            createAgeRiskPlot(data.charts.age_risk);
+            createCorrelationHeatmap(data.charts.correlation_heatmap);
+        } else {
+            showChartsUnavailable(data.message || 'Charts unavailable');
+        }
+    } catch (error) {
+        console.error('Error loading chart data:', error);
+        showChartsUnavailable('Charts unavailable');
+    }
+}
+
+function showChartsUnavailable(message) {
+    document.querySelectorAll('.plotly-chart').forEach(element => {
+        element.replaceChildren(document.createTextNode(message));
+    });
+}
+
+function createAgeDistributionPlot(hist) {
+    const element = document.getElementById('ageDistributionPlot');
+    if (!element || !hist) return;
+    
+    const edges = hist.bin_edges;
+    const centers = edges.slice(0, -1).map((edge, i) => (edge + edges[i + 1]) / 2);
+    const widths = edges.slice(0, -1).map((edge, i) => edges[i + 1] - edge);
+    
+    element.replaceChildren();
+    Plotly.newPlot(element, [
+        { type: 'bar', name: 'Healthy', x: centers, y: hist.healthy, width: widths, marker: { color: '#28a745' }, opacity: 0.7 },
+        { type: 'bar', name: 'Heart Disease', x: centers, y: hist.disease, width: widths, marker: { color: '#dc3545' }, opacity: 0.7 }
+    ], {
+        ...plotlyLayout,
+        barmode: 'overlay',
+        xaxis: { title: 'Age' },
+        yaxis: { title: 'Count' },
+        legend: { orientation: 'h', y: 1.1 }
+    }, { responsive: true, displayModeBar: false });
+}
+
+function createAgeRiskPlot(ageRisk) {
+    const element = document.getElementById('ageRiskPlot');
+    if (!element || !ageRisk) return;
+    
+    element.replaceChildren();
+    Plotly.newPlot(element, [{
+        type: 'bar',
+        x: ageRisk.groups,
+        y: ageRisk.risk_percentage,
+        marker: { color: '#dc3545' },
+        hovertemplate: '%{x}: %{y:.1f}%<extra></extra>'
+    }], {
+        ...plotlyLayout,
+        xaxis: { title: 'Age Group' },
+        yaxis: { title: 'Risk Percentage', range: [0, 100] }
+    }, { responsive: true, displayModeBar: false });
+}
+
+function createCorrelationHeatmap(corr) {
+    const element = document.getElementById('correlationHeatmapPlot');
+    if (!element || !corr) return;
+    
+    element.replaceChildren();
+    Plotly.newPlot(element, [{
+        type: 'heatmap',
+        x: corr.features,
+        y: corr.features,
+        z: corr.matrix,
+        zmin: -1,
+        zmax: 1,
+        colorscale: 'RdBu',
+        reversescale: true,
+        text: corr.matrix.map(row => row.map(value => value.toFixed(2))),
+        texttemplate: '%{text}',
+        hovertemplate: '%{y} / %{x}: %{z:.2f}<extra></extra>'
+    }], {
+        ...plotlyLayout,
+        height: 400,
+        yaxis: { autorange: 'reversed' }
+    }, { responsive: true, displayModeBar: false });
+}
+
 function updateBasicStats(stats) {
     if (!stats) return;
 
@@ -967,6 +1065,7 @@ document.addEventListener('DOMContentLoaded', function() {
     destroyAgeChart();
     // Load fresh statistics
     loadStatistics();
+    loadChartData();
 });
 
 // Initialize charts if we're on the statistics page
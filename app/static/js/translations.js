@@ -100,6 +100,9 @@ const translations = {
         diseaseRate: "Disease Rate",
         averageAge: "Average Age",
         ageDistributionAndDiseaseRisk: "Age Distribution and Disease Risk",
+        ageDistributionByStatus: "Age Distribution by Heart Disease Status",
+        riskByAgeGroup: "Heart Disease Risk by Age Group",
+        correlationHeatmap: "Feature Correlation Heatmap",
         keyRiskFactors: "Key Risk Factors",
         chestPainTypes: "Chest Pain Types",
         bloodSugarImpact: "Blood Sugar Impact",
@@ -252,6 +255,9 @@ const translations = {
         diseaseRate: "Xəstəlik Dərəcəsi",
         averageAge: "Orta Yaş",
         ageDistributionAndDiseaseRisk: "Yaş Bölgüsü və Xəstəlik Riski",
+        ageDistributionByStatus: "Ürək Xəstəliyi Vəziyyətinə görə Yaş Bölgüsü",
+        riskByAgeGroup: "Yaş Qruplarına görə Ürək Xəstəliyi Riski",
+        correlationHeatmap: "Əlamət Korrelyasiya İstilik Xəritəsi",
         keyRiskFactors: "Əsas Risk Faktorları",
         chestPainTypes: "Döş Ağrısı Növləri",
         bloodSugarImpact: "Qan Şəkərinin Təsiri",